@@ -1,24 +1,115 @@
 import json
+import logging
 import os
-from datetime import datetime, timedelta
-from typing import Dict
-
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import orjson
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, which also serializes NumPy arrays and scalars natively"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_ymd(value: str) -> date:
+    """Parse a YYYY-MM-DD date string (month and day may be unpadded), raise ValueError otherwise"""
+    # date.fromisoformat is much faster than strptime but also accepts other ISO 8601 forms,
+    # so it only handles the canonical zero-padded layout
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        return date.fromisoformat(value)
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _date_range(start_date: str, end_date: str) -> Tuple[str, ...]:
+    """All YYYY-MM-DD dates from start_date to end_date inclusive"""
+    start = parse_ymd(start_date)
+    end = parse_ymd(end_date)
+    return tuple((start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1))
+
+
+def _is_successful_response(response: requests.Response) -> bool:
+    """Only cache API responses that actually carry rates"""
+    try:
+        return response.json().get('success', False)
+    except ValueError:
+        return False
 
 
 class ExchangeRateService:
     def __init__(self):
         self.base_url = "https://api.exchangerate.host"
+        self.historical_url = f"{self.base_url}/historical"
         self.fallback_file = "data/sample_api.json"
         self.api_key = os.getenv("EXCHANGE_RATE_API_KEY")
-
-    def get_rates(self, start_date: str, end_date: str, from_currency: str = "USD", to_currency: str = "EUR") -> Dict:
+        self._fallback_cache = None
+        self._fallback_lock = threading.Lock()
+        self.max_workers = 16
+
+        # Shared session so concurrent requests reuse pooled keep-alive connections.
+        # Responses are also cached on disk, which survives restarts and is shared by workers.
+        self.session = requests_cache.CachedSession(
+            'cache/exchange',
+            backend='sqlite',
+            expire_after=timedelta(days=30),
+            ignored_parameters=['access_key'],
+            filter_fn=_is_successful_response
+        )
+        # Rate limiting and transient 5xx responses are retried with backoff before falling back.
+        # Timeouts and connection errors are not, so a hung upstream costs one timeout per request.
+        # Once retries run out the last response is returned, so the usual status_code checks handle it.
+        retry = Retry(total=3, connect=0, read=0, backoff_factor=0.2,
+                      status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Past rates never change, so successful per-day lookups are memoized
+        self._cached_fetch_day = lru_cache(maxsize=131072)(self._fetch_day)
+
+    def _expire_after(self, end_date: str) -> Optional[int]:
+        """HTTP cache lifetime override: rates up to today may still move, older ones use the default"""
+        return 60 if end_date >= date.today().isoformat() else None
+
+    def cache_info(self) -> Dict:
+        """Hit/miss statistics of the per-day rate cache"""
+        return self._cached_fetch_day.cache_info()._asdict()
+
+    def get_rates(self, start_date: Union[str, date], end_date: Union[str, date],
+                  from_currency: str = "USD", to_currency: str = "EUR") -> Dict:
         """
         Get exchange rates for a date range. Try API first, fallback to local file.
+        Dates may be YYYY-MM-DD strings or already parsed date objects.
         """
+        # Everything below works on ISO strings, which is also what the API expects
+        if isinstance(start_date, date):
+            start_date = start_date.isoformat()
+        if isinstance(end_date, date):
+            end_date = end_date.isoformat()
+
         try:
             # Try timeframe endpoint for date ranges (if available)
             if start_date != end_date:
@@ -28,52 +119,99 @@ class ExchangeRateService:
                 return self._get_historical_rate(start_date, from_currency, to_currency)
 
         except Exception as e:
-            print(f"API request failed: {e}")
+            logger.warning("API request failed: %s", e)
             return self._load_fallback_data(start_date, end_date)
 
     def _get_timeframe_rates(self, start_date: str, end_date: str, from_currency: str, to_currency: str) -> Dict:
-        """Get rates for a time frame using timeframe endpoint (fallback to day-by-day)"""
+        """Get rates for a time frame from a range endpoint (fallback to day-by-day)"""
+        range_rates = self._get_range_rates(start_date, end_date, from_currency, to_currency)
+        if range_rates:
+            return range_rates
+
+        # Fallback to day-by-day requests
+        return self._get_rates_day_by_day(start_date, end_date, from_currency, to_currency)
+
+    def _get_range_rates(self, start_date: str, end_date: str, from_currency: str, to_currency: str) -> Optional[Dict]:
+        """Get a whole time frame in one call from the timeframe or timeseries endpoint, None if neither works"""
         try:
-            # Try timeframe endpoint first (requires paid plan)
-            url = f"{self.base_url}/timeframe"
-            params = {
-                'access_key': self.api_key,
-                'start_date': start_date,
-                'end_date': end_date,
-                'source': from_currency,
-                'currencies': to_currency
-            }
+            timeframe = self._get_timeframe_batch(start_date, end_date, from_currency, to_currency)
+            if timeframe:
+                return timeframe
+        except Exception as e:
+            logger.warning("Timeframe API request failed: %s", e)
 
-            response = requests.get(url, params=params, timeout=10)
+        try:
+            # Free timeseries endpoint returns the whole range in one call
+            return self._get_timeseries_rates(start_date, end_date, from_currency, to_currency)
+        except Exception as e:
+            logger.warning("Timeseries API request failed: %s", e)
+            return None
+
+    def _get_timeframe_batch(self, start_date: str, end_date: str, from_currency: str, to_currency: str) -> Optional[Dict]:
+        """Get rates for a time frame using the timeframe endpoint (requires paid plan), None if it is unavailable"""
+        url = f"{self.base_url}/timeframe"
+        params = {
+            'access_key': self.api_key,
+            'start_date': start_date,
+            'end_date': end_date,
+            'source': from_currency,
+            'currencies': to_currency
+        }
 
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success', False) and 'quotes' in data:
-                    # Convert timeframe format to our expected format
-                    rates = {}
-                    for date_str, quote_data in data['quotes'].items():
-                        currency_pair = f"{from_currency}{to_currency}"
-                        if currency_pair in quote_data:
-                            rates[date_str] = {to_currency: quote_data[currency_pair]}
+        response = self.session.get(url, params=params, timeout=10, expire_after=self._expire_after(end_date))
+
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('success', False) and 'quotes' in data:
+                # Convert timeframe format to our expected format
+                rates = {}
+                currency_pair = f"{from_currency}{to_currency}"
+                for date_str, quote_data in data['quotes'].items():
+                    if currency_pair in quote_data:
+                        rates[date_str] = {to_currency: quote_data[currency_pair]}
+
+                return {
+                    'success': True,
+                    'historical': True,
+                    'base': from_currency,
+                    'rates': rates
+                }
+
+        return None
 
+    def _get_timeseries_rates(self, start_date: str, end_date: str, from_currency: str, to_currency: str) -> Optional[Dict]:
+        """Get rates for a time frame using the timeseries endpoint, None if it is unavailable"""
+        url = f"{self.base_url}/timeseries"
+        params = {
+            'access_key': self.api_key,
+            'start_date': start_date,
+            'end_date': end_date,
+            'base': from_currency,
+            'symbols': to_currency
+        }
+
+        response = self.session.get(url, params=params, timeout=10, expire_after=self._expire_after(end_date))
+
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('success', False) and data.get('rates'):
+                # Already keyed by date in our expected format
+                rates = {date_str: rate_data for date_str, rate_data in data['rates'].items()
+                         if to_currency in rate_data}
+                if rates:
                     return {
                         'success': True,
                         'historical': True,
                         'base': from_currency,
-                        'rates': rates
+                        'rates': dict(sorted(rates.items()))
                     }
 
-            # Fallback to day-by-day requests
-            return self._get_rates_day_by_day(start_date, end_date, from_currency, to_currency)
-
-        except Exception as e:
-            print(f"Timeframe API request failed: {e}")
-            return self._get_rates_day_by_day(start_date, end_date, from_currency, to_currency)
+        return None
 
     def _get_historical_rate(self, date: str, from_currency: str, to_currency: str) -> Dict:
         """Get historical rate for a single date"""
         try:
-            url = f"{self.base_url}/historical"
+            url = self.historical_url
             params = {
                 'access_key': self.api_key,
                 'date': date,
@@ -81,7 +219,7 @@ class ExchangeRateService:
                 'currencies': to_currency
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10, expire_after=self._expire_after(date))
 
             if response.status_code == 200:
                 data = response.json()
@@ -100,79 +238,164 @@ class ExchangeRateService:
             raise Exception("No historical data available")
 
         except Exception as e:
-            print(f"Historical API request failed: {e}")
+            logger.warning("Historical API request failed: %s", e)
             return self._load_fallback_data(date, date)
 
-    def _get_rates_day_by_day(self, start_date: str, end_date: str, from_currency: str, to_currency: str) -> Dict:
-        """Get rates day by day using historical endpoint"""
+    def stream_rates(self, start_date: Union[str, date], end_date: Union[str, date],
+                     from_currency: str = "USD", to_currency: str = "EUR") -> Iterator[Tuple[str, float]]:
+        """
+        Yield (date, rate) pairs for a date range from a single source.
+        A range endpoint is tried first and its rows are yielded in date order. Otherwise days are
+        fetched concurrently and yielded in completion order; if that fails before any day arrives,
+        the local fallback file is used instead. Days the API could not deliver are left out.
+        If the per-day requests fail after some days were yielded, the error is re-raised so the
+        caller can tell the stream is incomplete.
+        """
+        if isinstance(start_date, date):
+            start_date = start_date.isoformat()
+        if isinstance(end_date, date):
+            end_date = end_date.isoformat()
+
+        range_rates = self._get_range_rates(start_date, end_date, from_currency, to_currency)
+        if range_rates:
+            for date_str, rate_data in range_rates['rates'].items():
+                yield date_str, rate_data[to_currency]
+            return
+
+        emitted = False
         try:
-            start = datetime.strptime(start_date, '%Y-%m-%d')
-            end = datetime.strptime(end_date, '%Y-%m-%d')
-
-            rates = {}
-            current = start
-
-            while current <= end:
-                date_str = current.strftime('%Y-%m-%d')
-
-                # Use historical endpoint for each date
-                url = f"{self.base_url}/historical"
-                params = {
-                    'access_key': self.api_key,
-                    'date': date_str,
-                    'source': from_currency,
-                    'currencies': to_currency
-                }
+            for date_str, rate in self._iter_rates_day_by_day(start_date, end_date, from_currency, to_currency):
+                emitted = True
+                yield date_str, rate
+        except Exception as e:
+            logger.warning("Streaming API request failed: %s", e)
+            # Rows already sent came from the API, never mix in sample data
+            if emitted:
+                raise
 
-                response = requests.get(url, params=params, timeout=5)
+        if emitted:
+            return
 
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('success', False) and 'quotes' in data:
-                        currency_pair = f"{from_currency}{to_currency}"
-                        if currency_pair in data['quotes']:
-                            rates[date_str] = {to_currency: data['quotes'][currency_pair]}
+        fallback = self._load_fallback_data(start_date, end_date)
+        for date_str, rate_data in fallback.get('rates', {}).items():
+            if to_currency in rate_data:
+                yield date_str, rate_data[to_currency]
 
-                current += timedelta(days=1)
+    def _get_rates_day_by_day(self, start_date: str, end_date: str, from_currency: str, to_currency: str) -> Dict:
+        """Get rates day by day using historical endpoint (requests run concurrently)"""
+        try:
+            rates = {date_str: {to_currency: rate} for date_str, rate
+                     in self._iter_rates_day_by_day(start_date, end_date, from_currency, to_currency)}
 
             if rates:
                 return {
                     'success': True,
                     'historical': True,
                     'base': from_currency,
-                    'rates': rates
+                    # Futures complete out of order, keep the response chronological
+                    'rates': dict(sorted(rates.items()))
                 }
             else:
                 raise Exception("No rates retrieved")
 
         except Exception as e:
-            print(f"Day-by-day API request failed: {e}")
+            logger.warning("Day-by-day API request failed: %s", e)
             return self._load_fallback_data(start_date, end_date)
 
-    def _load_fallback_data(self, start_date: str, end_date: str) -> Dict:
-        """Load fallback data from local file"""
+    def _iter_rates_day_by_day(self, start_date: str, end_date: str,
+                               from_currency: str, to_currency: str) -> Iterator[Tuple[str, float]]:
+        """Fetch every day of the range concurrently, yielding available rates as they complete"""
+        dates = _date_range(start_date, end_date)
+        if not dates:
+            return
+
+        # Never start more threads than there are dates to fetch
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(dates)))
         try:
-            with open(self.fallback_file, 'r') as f:
-                data = json.load(f)
+            futures = [executor.submit(self._fetch_one_day, date_str, from_currency, to_currency)
+                       for date_str in dates]
+            for future in as_completed(futures):
+                date_str, rate = future.result()
+                if rate is not None:
+                    yield date_str, rate
+        finally:
+            # A failed day or a consumer that stops early must not wait for the queued requests
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_one_day(self, date_str: str, from_currency: str, to_currency: str) -> Tuple[str, Optional[float]]:
+        """Get a single day's rate, None if unavailable. Today's rate may still move, so it bypasses the cache"""
+        today = date.today().isoformat()
+        fetch = self._fetch_day if date_str >= today else self._cached_fetch_day
+        try:
+            return date_str, fetch(date_str, from_currency, to_currency)
+        except LookupError:
+            return date_str, None
+
+    def _fetch_day(self, date_str: str, from_currency: str, to_currency: str) -> float:
+        """Fetch a single day's rate from the historical endpoint, raise LookupError if unavailable"""
+        params = {
+            'access_key': self.api_key,
+            'date': date_str,
+            'source': from_currency,
+            'currencies': to_currency
+        }
 
-            # Filter data to requested date range
-            start = datetime.strptime(start_date, '%Y-%m-%d')
-            end = datetime.strptime(end_date, '%Y-%m-%d')
+        response = self.session.get(self.historical_url, params=params, timeout=5,
+                                    expire_after=self._expire_after(date_str))
 
-            filtered_rates = {}
-            for date_str, rate_data in data['rates'].items():
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                if start <= date_obj <= end:
-                    filtered_rates[date_str] = rate_data
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('success', False) and 'quotes' in data:
+                currency_pair = f"{from_currency}{to_currency}"
+                if currency_pair in data['quotes']:
+                    return data['quotes'][currency_pair]
+
+        # Raising keeps misses out of the cache so they are retried next time
+        raise LookupError(f"No rate for {date_str}")
+
+    def _get_fallback(self) -> Tuple[List[str], Dict[str, List[str]], Dict, str]:
+        """Parse the fallback file once and index its dates into sorted per-month buckets"""
+        if self._fallback_cache is None:
+            with self._fallback_lock:
+                # Another request may have populated it while we waited for the lock
+                if self._fallback_cache is None:
+                    with open(self.fallback_file, 'r') as f:
+                        data = json.load(f)
+
+                    month_buckets = defaultdict(list)
+                    for date_str in sorted(data['rates']):
+                        month_buckets[date_str[:7]].append(date_str)
+
+                    self._fallback_cache = (sorted(month_buckets), dict(month_buckets),
+                                            data['rates'], data.get('base', 'USD'))
+        return self._fallback_cache
+
+    def _load_fallback_data(self, start_date: str, end_date: str) -> Dict:
+        """Load fallback data from local file"""
+        try:
+            months, month_buckets, rates, base = self._get_fallback()
+
+            # ISO dates sort lexicographically, so the range is selected without parsing:
+            # inner months are taken whole and only the two boundary months are filtered
+            start_month, end_month = start_date[:7], end_date[:7]
+            selected_dates = []
+            for month in months[bisect_left(months, start_month):bisect_right(months, end_month)]:
+                if month == start_month or month == end_month:
+                    selected_dates.extend(date_str for date_str in month_buckets[month]
+                                          if start_date <= date_str <= end_date)
+                else:
+                    selected_dates.extend(month_buckets[month])
+            filtered_rates = {date_str: rates[date_str] for date_str in selected_dates}
 
             return {
                 'success': True,
                 'historical': True,
-                'base': data.get('base', 'USD'),
+                'fallback': True,
+                'base': base,
                 'rates': filtered_rates
             }
         except Exception as e:
-            print(f"Fallback data loading failed: {e}")
+            logger.error("Fallback data loading failed: %s", e)
             return {'success': False, 'error': str(e)}
 
 
@@ -185,8 +408,13 @@ class FinanceCalculator:
         return ((new_value - old_value) / old_value) * 100
 
     @staticmethod
-    def process_rates_data(rates_data: Dict, to_currency: str = 'EUR', breakdown: str = 'day') -> Dict:
-        """Process rates data and calculate statistics"""
+    def process_rates_data(rates_data: Dict, to_currency: str = 'EUR', breakdown: str = 'day',
+                           undefined_change: Optional[float] = None) -> Dict:
+        """
+        Process rates data and calculate statistics.
+        breakdown: 'day' for per-day dicts, 'series' for parallel date/rate/change arrays, anything else for totals only
+        undefined_change: value used in the 'series' changes where the previous rate is zero
+        """
         if not rates_data.get('success', False):
             return {'error': 'Failed to retrieve rates data'}
 
@@ -198,31 +426,29 @@ class FinanceCalculator:
         sorted_dates = sorted(rates.keys())
 
         # Extract rate values for the target currency
-        daily_data = []
-        rate_values = []
-
-        for i, date in enumerate(sorted_dates):
-            # Get the rate for the target currency
-            rate = rates[date].get(to_currency, 0)
-            rate_values.append(rate)
-
-            # Calculate percentage change from previous day
-            pct_change = 0.0
-            if i > 0:
-                prev_rate = rate_values[i - 1]
-                pct_change = FinanceCalculator.calculate_percentage_change(prev_rate, rate)
-
-            daily_data.append({
-                'date': date,
-                'rate': round(rate, 5),
-                'pct_change': round(pct_change, 2) if pct_change != float('inf') else 'N/A'
-            })
+        rate_values = np.fromiter((rates[date].get(to_currency, 0.0) for date in sorted_dates),
+                                  dtype=np.float64, count=len(sorted_dates))
+
+        # Percentage change from previous day, computed over the whole series at once.
+        # A change from a zero rate is 0 if the rate stays at zero and undefined (inf) otherwise.
+        prev_values = rate_values[:-1]
+        diffs = np.diff(rate_values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_changes = np.where(prev_values == 0, np.where(diffs == 0, 0.0, np.inf), diffs / prev_values * 100)
+        pct_changes = np.concatenate(([0.0], pct_changes))
+        undefined = np.isinf(pct_changes)
+
+        # Round with Python's round() so rows agree with the totals below (np.round scales first)
+        values = rate_values.tolist()
+        rounded_rates = [round(rate, 5) for rate in values]
+        rounded_changes = np.array([round(pct_change, 2) for pct_change in pct_changes.tolist()], dtype=object)
 
         # Calculate totals
-        start_rate = rate_values[0] if rate_values else 0
-        end_rate = rate_values[-1] if rate_values else 0
+        start_rate = float(rate_values[0])
+        end_rate = float(rate_values[-1])
         total_pct_change = FinanceCalculator.calculate_percentage_change(start_rate, end_rate)
-        mean_rate = sum(rate_values) / len(rate_values) if rate_values else 0
+        # Left-to-right sum, NumPy's pairwise summation can differ in the last bit
+        mean_rate = sum(values) / len(values)
 
         result = {
             'totals': {
@@ -234,7 +460,23 @@ class FinanceCalculator:
         }
 
         if breakdown == 'day':
-            result['breakdown'] = daily_data
+            rounded_changes[undefined] = 'N/A'
+            result['breakdown'] = [
+                {
+                    'date': date,
+                    'rate': rate,
+                    'pct_change': pct_change
+                }
+                for date, rate, pct_change in zip(sorted_dates, rounded_rates, rounded_changes.tolist())
+            ]
+        elif breakdown == 'series':
+            # Parallel arrays for charting
+            rounded_changes[undefined] = undefined_change
+            result['series'] = {
+                'dates': sorted_dates,
+                'rates': rounded_rates,
+                'pct_changes': rounded_changes.tolist()
+            }
 
         return result
 
@@ -250,6 +492,7 @@ def health():
     return jsonify({
         'status': 'healthy',
         'service': 'Exchange Rate API',
+        'rate_cache': exchange_service.cache_info(),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -261,7 +504,7 @@ def finance():
     Query parameters:
     - start: Start date (YYYY-MM-DD)
     - end: End date (YYYY-MM-DD)
-    - breakdown: 'day' or 'none' (default: 'day')
+    - breakdown: 'day', 'series' or 'none' (default: 'day')
     - from_currency: Source currency (default: 'USD')
     - to_currency: Target currency (default: 'EUR')
     """
@@ -282,16 +525,22 @@ def finance():
 
         # Validate date format
         try:
-            datetime.strptime(start_date, '%Y-%m-%d')
-            datetime.strptime(end_date, '%Y-%m-%d')
+            start = parse_ymd(start_date)
+            end = parse_ymd(end_date)
         except ValueError:
             return jsonify({
                 'error': 'Invalid date format. Use YYYY-MM-DD',
                 'example': '/finance?start=2025-07-01&end=2025-07-03'
             }), 400
 
+        if start > end:
+            return jsonify({
+                'error': 'Start date must not be after end date',
+                'example': '/finance?start=2025-07-01&end=2025-07-03'
+            }), 400
+
         # Get exchange rates
-        rates_data = exchange_service.get_rates(start_date, end_date, from_currency, to_currency)
+        rates_data = exchange_service.get_rates(start, end, from_currency, to_currency)
 
         # Process and calculate statistics
         result = calculator.process_rates_data(rates_data, to_currency, breakdown)
@@ -319,4 +568,5 @@ def finance():
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+    # Development server only, use gunicorn in production (see gunicorn.conf.py)
+    app.run(host='0.0.0.0', port=8000, debug=os.getenv('FLASK_DEBUG') == '1')
\ No newline at end of file
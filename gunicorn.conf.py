@@ -0,0 +1,55 @@
+"""
+Gunicorn configuration for production deployments.
+
+    gunicorn app:app                      # API service on :8000
+    gunicorn -b 0.0.0.0:8001 webapp:app   # Web application on :8001
+
+Upstream rate lookups block on network I/O, so each worker runs a pool of threads.
+Application and server logs are written to stdout as one JSON object per line.
+"""
+import json
+import logging
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+timeout = 60
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each log record as a single-line JSON object"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+logconfig_dict = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': JsonFormatter}
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json',
+            'stream': 'ext://sys.stdout'
+        }
+    },
+    'root': {'level': os.getenv('LOG_LEVEL', 'INFO'), 'handlers': ['console']},
+    'loggers': {
+        'gunicorn.error': {'level': 'INFO', 'handlers': ['console'], 'propagate': False},
+        'gunicorn.access': {'level': 'INFO', 'handlers': ['console'], 'propagate': False}
+    }
+}
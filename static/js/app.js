@@ -14,45 +14,137 @@ function exchangeApp() {
         rateChart: null,
         changeChart: null,
 
+        // Open event stream
+        eventSource: null,
+
         // Initialize the app
         init() {
             this.fetchData();
         },
 
-        // Fetch data from API
-        async fetchData() {
+        // Stream data from API, drawing each day as soon as it arrives
+        fetchData() {
+            if (this.eventSource) {
+                this.eventSource.close();
+            }
+
             this.loading = true;
             this.error = null;
+            this.data = null;
+            this.destroyCharts();
+
+            const params = new URLSearchParams({
+                start: this.startDate,
+                end: this.endDate,
+                from: this.fromCurrency,
+                to: this.toCurrency
+            });
 
-            try {
-                const params = new URLSearchParams({
-                    start: this.startDate,
-                    end: this.endDate,
-                    from: this.fromCurrency,
-                    to: this.toCurrency
+            // Days arrive in completion order, keyed by date until the series is rebuilt
+            const points = {};
+            const source = new EventSource(`/api/rates/stream?${params}`);
+            this.eventSource = source;
+
+            source.onmessage = (event) => {
+                const point = JSON.parse(event.data);
+                points[point.date] = point.rate;
+                this.data = this.buildSeries(points, this.data?.totals);
+                this.$nextTick(() => {
+                    this.refreshCharts();
                 });
+            };
 
-                const response = await fetch(`/api/rates?${params}`);
-                const result = await response.json();
+            source.addEventListener('totals', (event) => {
+                const result = JSON.parse(event.data);
+                this.data = this.buildSeries(points, result.totals);
+                this.finishStream();
+            });
 
-                if (!response.ok) {
-                    throw new Error(result.error || 'Failed to fetch data');
+            source.addEventListener('failure', (event) => {
+                const result = JSON.parse(event.data);
+                this.error = result.error || 'Failed to fetch data';
+                // A partial stream keeps the days already drawn, but has no totals
+                if (!result.partial) {
+                    this.data = null;
                 }
+                this.finishStream();
+            });
 
-                this.data = result;
-                this.error = null;
+            source.onerror = () => {
+                // The server closes the stream after the final event, so only report unfinished streams
+                if (this.eventSource !== source) return;
+                this.error = 'Failed to fetch data';
+                this.finishStream();
+            };
+        },
 
-                // Update charts after data is loaded
-                this.$nextTick(() => {
-                    this.updateCharts();
-                });
+        // Close the event stream and leave the loading state
+        finishStream() {
+            if (this.eventSource) {
+                this.eventSource.close();
+                this.eventSource = null;
+            }
+            this.loading = false;
+        },
+
+        // Build chronological chart arrays from the received points
+        buildSeries(points, totals) {
+            const labels = Object.keys(points).sort();
+            const rates = labels.map(date => points[date]);
+            const changes = rates.map((rate, i) => {
+                const prev = rates[i - 1];
+                if (i === 0 || prev === 0) return 0;
+                return Math.round((rate - prev) / prev * 10000) / 100;
+            });
+
+            return { labels, rates, changes, totals };
+        },
+
+        // Redraw charts in place while points keep arriving
+        refreshCharts() {
+            if (!this.data) return;
 
-            } catch (err) {
-                this.error = err.message;
-                this.data = null;
-            } finally {
-                this.loading = false;
+            if (!this.rateChart || !this.changeChart) {
+                this.updateCharts();
+                return;
             }
+
+            this.rateChart.data.labels = this.data.labels;
+            this.rateChart.data.datasets[0].data = this.data.rates;
+
+            const colors = this.changeColors(this.data.changes);
+            const changeDataset = this.changeChart.data.datasets[0];
+            this.changeChart.data.labels = this.data.labels;
+            changeDataset.data = this.data.changes;
+            changeDataset.backgroundColor = colors.background;
+            changeDataset.borderColor = colors.border;
+
+            this.rateChart.update('none');
+            this.changeChart.update('none');
+        },
+
+        // Destroy both charts
+        destroyCharts() {
+            if (this.rateChart) {
+                this.rateChart.destroy();
+                this.rateChart = null;
+            }
+            if (this.changeChart) {
+                this.changeChart.destroy();
+                this.changeChart = null;
+            }
+        },
+
+        // Bar colors based on positive/negative changes
+        changeColors(changes) {
+            return {
+                background: changes.map(change =>
+                    change >= 0 ? 'rgba(34, 197, 94, 0.8)' : 'rgba(239, 68, 68, 0.8)'
+                ),
+                border: changes.map(change =>
+                    change >= 0 ? '#22c55e' : '#ef4444'
+                )
+            };
         },
 
         // Update both charts
@@ -181,13 +273,7 @@ function exchangeApp() {
             }
 
             // Create colors based on positive/negative changes
-            const colors = this.data.changes.map(change =>
-                change >= 0 ? 'rgba(34, 197, 94, 0.8)' : 'rgba(239, 68, 68, 0.8)'
-            );
-
-            const borderColors = this.data.changes.map(change =>
-                change >= 0 ? '#22c55e' : '#ef4444'
-            );
+            const colors = this.changeColors(this.data.changes);
 
             this.changeChart = new Chart(ctx, {
                 type: 'bar',
@@ -196,8 +282,8 @@ function exchangeApp() {
                     datasets: [{
                         label: 'Daily Change (%)',
                         data: this.data.changes,
-                        backgroundColor: colors,
-                        borderColor: borderColors,
+                        backgroundColor: colors.background,
+                        borderColor: colors.border,
                         borderWidth: 2,
                         borderRadius: 4,
                         borderSkipped: false
@@ -0,0 +1,93 @@
+import random
+import unittest
+
+from app import FinanceCalculator
+
+
+def baseline_process_rates_data(rates_data, to_currency='EUR', breakdown='day'):
+    """Pure-Python process_rates_data as it was before vectorization, used as the reference output"""
+    if not rates_data.get('success', False):
+        return {'error': 'Failed to retrieve rates data'}
+
+    rates = rates_data.get('rates', {})
+    if not rates:
+        return {'error': 'No rates data available'}
+
+    sorted_dates = sorted(rates.keys())
+    daily_data = []
+    rate_values = []
+
+    for i, date in enumerate(sorted_dates):
+        rate = rates[date].get(to_currency, 0)
+        rate_values.append(rate)
+
+        pct_change = 0.0
+        if i > 0:
+            pct_change = FinanceCalculator.calculate_percentage_change(rate_values[i - 1], rate)
+
+        daily_data.append({
+            'date': date,
+            'rate': round(rate, 5),
+            'pct_change': round(pct_change, 2) if pct_change != float('inf') else 'N/A'
+        })
+
+    start_rate = rate_values[0]
+    end_rate = rate_values[-1]
+    total_pct_change = FinanceCalculator.calculate_percentage_change(start_rate, end_rate)
+    mean_rate = sum(rate_values) / len(rate_values)
+
+    result = {
+        'totals': {
+            'start_rate': round(start_rate, 5),
+            'end_rate': round(end_rate, 5),
+            'total_pct_change': round(total_pct_change, 2) if total_pct_change != float('inf') else 'N/A',
+            'mean_rate': round(mean_rate, 5)
+        }
+    }
+
+    if breakdown == 'day':
+        result['breakdown'] = daily_data
+
+    return result
+
+
+def make_rates_data(values):
+    return {
+        'success': True,
+        'rates': {f"2025-01-{day:02d}": {'EUR': value} for day, value in enumerate(values, start=1)}
+    }
+
+
+class ProcessRatesDataTest(unittest.TestCase):
+    def assert_matches_baseline(self, values):
+        rates_data = make_rates_data(values)
+        for breakdown in ('day', 'none'):
+            self.assertEqual(FinanceCalculator.process_rates_data(rates_data, 'EUR', breakdown),
+                             baseline_process_rates_data(rates_data, 'EUR', breakdown), values)
+
+    def test_rounding_agrees_with_totals(self):
+        result = FinanceCalculator.process_rates_data(make_rates_data([0.595225, 1.0]))
+        self.assertEqual(result['breakdown'][0]['rate'], result['totals']['start_rate'])
+        self.assert_matches_baseline([0.595225, 1.0])
+
+    def test_zero_rates(self):
+        self.assert_matches_baseline([0.0, 0.0, 1.5, 1.2, 0.0, -1.0])
+        self.assert_matches_baseline([0.0])
+
+    def test_series_fills_undefined_changes(self):
+        rates_data = make_rates_data([0.0, 1.5, 1.2])
+        series = FinanceCalculator.process_rates_data(rates_data, 'EUR', 'series')['series']
+        self.assertEqual(series['pct_changes'], [0.0, None, -20.0])
+        series = FinanceCalculator.process_rates_data(rates_data, 'EUR', 'series', undefined_change=0)['series']
+        self.assertEqual(series['pct_changes'], [0.0, 0, -20.0])
+        self.assertEqual(series['rates'], [0.0, 1.5, 1.2])
+
+    def test_random_payloads_match_baseline(self):
+        rng = random.Random(1234)
+        for _ in range(3000):
+            values = [round(rng.uniform(0.5, 1.5), 6) for _ in range(rng.randint(1, 28))]
+            self.assert_matches_baseline(values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,16 +1,58 @@
-from datetime import datetime
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Optional, Tuple
 
-from flask import Flask, render_template, request, jsonify
+import orjson
+from flask import Flask, Response, render_template, request, jsonify
 
 app = Flask(__name__)
 
 # Import our existing services
-from app import ExchangeRateService, FinanceCalculator
+from app import ExchangeRateService, FinanceCalculator, ORJSONProvider, parse_ymd
+
+app.json = ORJSONProvider(app)
 
 # Initialize services
 exchange_service = ExchangeRateService()
 calculator = FinanceCalculator()
 
+# Serialized /api/rates payloads keyed by (start, end, from, to) -> (expiry or None, body)
+CHART_CACHE_SIZE = 1024
+CHART_CACHE_TTL = 60
+_chart_cache = OrderedDict()
+_chart_cache_lock = threading.Lock()
+
+
+def _get_cached_chart(key: Tuple[str, str, str, str]) -> Optional[bytes]:
+    """Return a still-valid cached chart payload, None on a miss"""
+    with _chart_cache_lock:
+        entry = _chart_cache.get(key)
+        if entry is None:
+            return None
+        expires, body = entry
+        if expires is not None and expires <= time.monotonic():
+            del _chart_cache[key]
+            return None
+        _chart_cache.move_to_end(key)
+        return body
+
+
+def _cache_chart(key: Tuple[str, str, str, str], body: bytes, complete: bool) -> None:
+    """
+    Store a chart payload. Only complete past ranges are kept until evicted; ranges reaching today
+    or missing days live for CHART_CACHE_TTL seconds so the missing rates are retried
+    """
+    permanent = complete and key[1] < date.today().isoformat()
+    expires = None if permanent else time.monotonic() + CHART_CACHE_TTL
+    with _chart_cache_lock:
+        _chart_cache[key] = (expires, body)
+        _chart_cache.move_to_end(key)
+        if len(_chart_cache) > CHART_CACHE_SIZE:
+            _chart_cache.popitem(last=False)
+
 
 @app.route('/')
 def index():
@@ -32,26 +74,34 @@ def api_rates():
 
         # Validate date format
         try:
-            datetime.strptime(start_date, '%Y-%m-%d')
-            datetime.strptime(end_date, '%Y-%m-%d')
+            start = parse_ymd(start_date)
+            end = parse_ymd(end_date)
         except ValueError:
             return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
 
+        if start > end:
+            return jsonify({'error': 'Start date must not be after end date'}), 400
+
+        cache_key = (start.isoformat(), end.isoformat(), from_currency, to_currency)
+        cached = _get_cached_chart(cache_key)
+        if cached is not None:
+            return Response(cached, mimetype='application/json')
+
         # Get exchange rates
-        rates_data = exchange_service.get_rates(start_date, end_date, from_currency, to_currency)
+        rates_data = exchange_service.get_rates(start, end, from_currency, to_currency)
 
         # Process data for visualization
-        result = calculator.process_rates_data(rates_data, to_currency, 'day')
+        result = calculator.process_rates_data(rates_data, to_currency, 'series', undefined_change=0)
 
         if 'error' in result:
             return jsonify(result), 500
 
-        # Format data for Chart.js
-        breakdown = result.get('breakdown', [])
+        # Series arrays map directly onto Chart.js datasets
+        series = result['series']
         chart_data = {
-            'labels': [day['date'] for day in breakdown],
-            'rates': [day['rate'] for day in breakdown],
-            'changes': [day['pct_change'] if day['pct_change'] != 'N/A' else 0 for day in breakdown],
+            'labels': series['dates'],
+            'rates': series['rates'],
+            'changes': series['pct_changes'],
             'totals': result['totals'],
             'metadata': {
                 'start_date': start_date,
@@ -62,21 +112,72 @@ def api_rates():
             }
         }
 
-        return jsonify(chart_data)
+        body = orjson.dumps(chart_data)
+        # Local sample data stands in for an API outage, so retry the API next time
+        if not rates_data.get('fallback', False):
+            _cache_chart(cache_key, body, complete=len(series['dates']) == (end - start).days + 1)
+
+        return Response(body, mimetype='application/json')
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/rates/stream')
+def api_rates_stream():
+    """
+    Server-sent events variant of /api/rates: one frame per day as soon as its rate arrives
+    (in completion order), then a final 'totals' event with the summary statistics, or a
+    'failure' event (with 'partial': true if some days were already sent)
+    """
+    start_date = request.args.get('start')
+    end_date = request.args.get('end')
+    from_currency = request.args.get('from', 'USD')
+    to_currency = request.args.get('to', 'EUR')
+
+    if not start_date or not end_date:
+        return jsonify({'error': 'Start and end dates are required'}), 400
+
+    # Validate date format
+    try:
+        start = parse_ymd(start_date)
+        end = parse_ymd(end_date)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+    if start > end:
+        return jsonify({'error': 'Start date must not be after end date'}), 400
+
+    def generate():
+        rates = {}
+        try:
+            for date_str, rate in exchange_service.stream_rates(start, end, from_currency, to_currency):
+                rates[date_str] = {to_currency: rate}
+                yield f"data: {orjson.dumps({'date': date_str, 'rate': rate}).decode()}\n\n"
+        except Exception as e:
+            # Days already sent stay valid, but totals over them would look complete
+            failure = {'error': f'Incomplete data: {e}', 'partial': True}
+            yield f"event: failure\ndata: {orjson.dumps(failure).decode()}\n\n"
+            return
+
+        result = calculator.process_rates_data({'success': True, 'rates': rates}, to_currency, 'none')
+        event = 'failure' if 'error' in result else 'totals'
+        yield f"event: {event}\ndata: {orjson.dumps(result).decode()}\n\n"
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
         'service': 'Exchange Rate Visualization App',
+        'rate_cache': exchange_service.cache_info(),
         'timestamp': datetime.now().isoformat()
     })
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8001, debug=True)
\ No newline at end of file
+    # Development server only, use gunicorn in production (see gunicorn.conf.py)
+    app.run(host='0.0.0.0', port=8001, debug=os.getenv('FLASK_DEBUG') == '1')
\ No newline at end of file